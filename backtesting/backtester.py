@@ -1,28 +1,82 @@
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
+import hashlib
+import json
+import logging
+import os
+import pickle
 from strategies.base_strategy import BaseStrategy
+from backtesting.result_store import (BacktestResultStore, PARAMETER_ATTRIBUTES,
+                                       get_strategy_parameters)
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
 
 class Backtester:
-    def __init__(self, initial_capital: float = 100000.0):
+    def __init__(self, initial_capital: float = 100000.0,
+                 result_store: Optional[BacktestResultStore] = None):
         self.initial_capital = initial_capital
+        self.result_store = result_store
         self.portfolio = {'cash': initial_capital, 'positions': {}}
         self.trade_history = []
+        self.equity_curve = []
         self.performance_metrics = {}
 
     def run_backtest(self, strategy: BaseStrategy, data: pd.DataFrame,
-                    start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+                    start_date: datetime, end_date: datetime,
+                    checkpoint_path: Optional[str] = None) -> Dict[str, Any]:
         """
         Run backtest for a given strategy and data
+
+        If checkpoint_path is given and holds a checkpoint whose processed
+        prefix matches the start of data, engine and strategy state are
+        restored and only the bars after the checkpoint are processed.
+        The checkpoint is rewritten at the end of the run.
+
+        If a result store is configured and the backtester has not run
+        before, a stored result for the same strategy, parameters, data,
+        date range and engine configuration is returned without rerunning.
+        The result store is not used when checkpoint_path is given, since
+        a stored result carries no strategy state to checkpoint.
         """
         # Filter data for backtest period
         data = data[(data.index >= start_date) & (data.index <= end_date)]
+
+        # Results only depend on the run inputs when starting from a clean state
+        use_store = (self.result_store is not None and checkpoint_path is None
+                     and self._is_fresh())
+        if use_store:
+            data_hash = self._hash_data(data)
+            engine_config = self.get_engine_config()
+            result_key = self.result_store.make_key(
+                strategy, data_hash, start_date, end_date, engine_config)
+            stored = self.result_store.get(result_key)
+            if stored is not None:
+                self.portfolio = stored['portfolio']
+                self.trade_history = stored['trade_history']
+                self.equity_curve = [
+                    {'timestamp': timestamp, 'value': value}
+                    for timestamp, value in stored['equity_curve'].items()
+                ]
+                self.performance_metrics = stored['performance_metrics']
+                return stored
         
-        # Initialize strategy
-        strategy.initialize()
+        new_data = data
+        checkpoint = None
+        if checkpoint_path is not None:
+            checkpoint = self.load_checkpoint(checkpoint_path, strategy, data, start_date)
+
+        if checkpoint is not None:
+            # Resume after the last bar processed by the previous run
+            new_data = data[data.index > checkpoint['last_timestamp']]
+        else:
+            # Initialize strategy
+            strategy.initialize()
         
         # Main backtest loop
-        for timestamp, row in data.iterrows():
+        for timestamp, row in new_data.iterrows():
             # Update strategy with new data
             strategy.update(timestamp, row)
             
@@ -34,16 +88,52 @@ class Backtester:
             
             # Update portfolio metrics
             self.update_portfolio(row)
+            self.equity_curve.append({'timestamp': timestamp,
+                                      'value': self.portfolio['value']})
         
         # Calculate final performance metrics
         self.calculate_performance_metrics(data)
+
+        if checkpoint_path is not None and len(data) > 0:
+            self.save_checkpoint(checkpoint_path, strategy, data, start_date)
         
-        return {
+        result = {
             'portfolio': self.portfolio,
             'trade_history': self.trade_history,
-            'performance_metrics': self.performance_metrics
+            'performance_metrics': self.performance_metrics,
+            'equity_curve': self.get_equity_curve()
         }
 
+        if use_store:
+            self.result_store.put(result_key, strategy, start_date, end_date,
+                                  data_hash, engine_config, result)
+
+        return result
+
+    def get_equity_curve(self) -> pd.Series:
+        """
+        Get portfolio value after each processed bar
+        """
+        return pd.Series(
+            [point['value'] for point in self.equity_curve],
+            index=pd.Index([point['timestamp'] for point in self.equity_curve]),
+            name='value',
+            dtype=float
+        )
+
+    def get_engine_config(self) -> Dict[str, Any]:
+        """
+        Get engine settings that affect backtest results
+        """
+        return {'initial_capital': self.initial_capital}
+
+    def _is_fresh(self) -> bool:
+        """
+        Check whether the backtester is still in its initial state
+        """
+        return (self.portfolio == {'cash': self.initial_capital, 'positions': {}}
+                and not self.trade_history and not self.equity_curve)
+
     def execute_trades(self, signals: Dict[str, str], market_data: pd.Series):
         """
         Execute trades based on generated signals
@@ -103,3 +193,120 @@ class Backtester:
         cumulative_max = data.cummax()
         drawdown = (data - cumulative_max) / cumulative_max
         self.performance_metrics['max_drawdown'] = drawdown.min()
+
+    def save_checkpoint(self, path: str, strategy: BaseStrategy,
+                        data: pd.DataFrame, start_date: datetime):
+        """
+        Save engine and strategy state after processing data.
+        Errors are logged and leave any previous checkpoint in place.
+        """
+        checkpoint = {
+            'version': CHECKPOINT_VERSION,
+            'strategy_class': self._qualified_name(strategy),
+            'strategy_params_hash': self._hash_parameters(strategy),
+            # Parameters come from the caller's strategy, only derived
+            # state such as indicator buffers is checkpointed
+            'strategy_state': {key: value for key, value in strategy.__dict__.items()
+                               if key not in PARAMETER_ATTRIBUTES},
+            'initial_capital': self.initial_capital,
+            'portfolio': self.portfolio,
+            'trade_history': self.trade_history,
+            'equity_curve': self.equity_curve,
+            'start_date': start_date,
+            'last_timestamp': data.index[-1],
+            'num_rows': len(data),
+            'data_hash': self._hash_data(data)
+        }
+        # Write to a temporary file first so an interrupted run never
+        # leaves a truncated checkpoint behind
+        tmp_path = f"{path}.tmp"
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            # Strategy state may hold unpicklable objects such as locks or
+            # clients, which must not cost the caller the finished run
+            logger.warning(f"Error saving checkpoint {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def load_checkpoint(self, path: str, strategy: BaseStrategy,
+                        data: pd.DataFrame,
+                        start_date: datetime) -> Optional[Dict[str, Any]]:
+        """
+        Restore engine and strategy state from a checkpoint.
+        Returns the checkpoint if it is valid for data, otherwise None
+        and the current state is left untouched.
+        """
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                checkpoint = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Error loading checkpoint {path}: {e}")
+            return None
+
+        if not self._is_checkpoint_valid(checkpoint, strategy, data, start_date):
+            logger.warning(f"Ignoring stale checkpoint {path}")
+            return None
+
+        self.portfolio = checkpoint['portfolio']
+        self.trade_history = checkpoint['trade_history']
+        self.equity_curve = checkpoint['equity_curve']
+        strategy.__dict__.update({
+            key: value for key, value in checkpoint['strategy_state'].items()
+            if key not in PARAMETER_ATTRIBUTES
+        })
+        return checkpoint
+
+    def _is_checkpoint_valid(self, checkpoint: Dict[str, Any],
+                             strategy: BaseStrategy, data: pd.DataFrame,
+                             start_date: datetime) -> bool:
+        """
+        Check that a checkpoint was produced by an identical run over a
+        prefix of data
+        """
+        if checkpoint.get('version') != CHECKPOINT_VERSION:
+            return False
+        if checkpoint['strategy_class'] != self._qualified_name(strategy):
+            return False
+        if checkpoint['strategy_params_hash'] != self._hash_parameters(strategy):
+            return False
+        if checkpoint['initial_capital'] != self.initial_capital:
+            return False
+        if checkpoint['start_date'] != start_date:
+            return False
+
+        prefix = data[data.index <= checkpoint['last_timestamp']]
+        if len(prefix) != checkpoint['num_rows']:
+            return False
+        return self._hash_data(prefix) == checkpoint['data_hash']
+
+    @staticmethod
+    def _hash_data(data: pd.DataFrame) -> str:
+        """
+        Hash data contents, index and columns
+        """
+        digest = hashlib.sha256()
+        digest.update(repr(list(data.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _hash_parameters(strategy: BaseStrategy) -> str:
+        """
+        Hash strategy parameters
+        """
+        payload = json.dumps(get_strategy_parameters(strategy),
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def _qualified_name(obj: Any) -> str:
+        return f"{type(obj).__module__}.{type(obj).__qualname__}"
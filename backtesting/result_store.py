@@ -0,0 +1,462 @@
+import pandas as pd
+from typing import Dict, Any, Optional, List, Tuple
+from contextlib import contextmanager
+from datetime import datetime
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+
+logger = logging.getLogger(__name__)
+
+TRADE_COLUMNS = ['timestamp', 'symbol', 'action', 'price', 'quantity']
+POSITION_COLUMNS = ['symbol', 'quantity', 'entry_price']
+INDEX_COLUMNS = ['key', 'strategy', 'params', 'start_date', 'end_date',
+                 'data_hash', 'engine_config', 'total_return', 'final_value',
+                 'num_trades', 'size_bytes', 'created_at', 'last_accessed']
+SUMMARY_FILE = 'summary.json'
+METRICS_FILE = 'metrics.parquet'
+COLUMN_METRICS_FILE = 'column_metrics.parquet'
+LOCK_TIMEOUT = 30.0  # seconds after which an index lock is considered stale
+# Strategies keep their settings under different attribute names
+PARAMETER_ATTRIBUTES = ('config', 'parameters', 'params')
+
+def get_strategy_parameters(strategy: Any) -> Dict[str, Dict[str, Any]]:
+    """
+    Get every non-empty parameter dict of a strategy, keyed by attribute name
+    """
+    parameters = {}
+    for attr in PARAMETER_ATTRIBUTES:
+        params = getattr(strategy, attr, None)
+        if isinstance(params, dict) and params:
+            parameters[attr] = params
+    return parameters
+
+class BacktestResultStore:
+    """
+    Content-addressed store of backtest results.
+
+    Each result is keyed by a hash of the strategy class and parameters,
+    the data fingerprint, the date range and the engine configuration.
+    Equity curves, trade ledgers, final positions and metrics are stored
+    as parquet files, one directory per key, and a parquet index holds
+    one summary row per result for querying. When the store grows past
+    max_size_bytes the least recently accessed results are evicted.
+
+    Several processes can share a store. Index writes re-read and merge
+    the index under a lock file, and each result directory also holds
+    its summary row so results missing from the index are restored when
+    a store is opened. Access times are batched and written every
+    access_flush_interval reads, on the next write, or on flush().
+    """
+
+    def __init__(self, store_dir: str = './data/results',
+                 max_size_bytes: Optional[int] = 1024 ** 3,
+                 access_flush_interval: int = 100):
+        self.store_dir = store_dir
+        self.max_size_bytes = max_size_bytes
+        self.access_flush_interval = access_flush_interval
+        self.index_path = os.path.join(self.store_dir, 'index.parquet')
+        self.lock_path = f"{self.index_path}.lock"
+        self._pending_access = {}
+        os.makedirs(self.store_dir, exist_ok=True)
+        self._index = self._load_index()
+        self._rebuild_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def make_key(self, strategy: Any, data_hash: str,
+                 start_date: datetime, end_date: datetime,
+                 engine_config: Dict[str, Any]) -> str:
+        """
+        Generate the content address of a backtest run
+        """
+        payload = json.dumps({
+            'strategy': self._strategy_name(strategy),
+            'params': get_strategy_parameters(strategy),
+            'data_hash': data_hash,
+            'start_date': pd.Timestamp(start_date).isoformat(),
+            'end_date': pd.Timestamp(end_date).isoformat(),
+            'engine_config': engine_config
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def contains(self, key: str) -> bool:
+        """
+        Check whether a result is stored under key, including results
+        written by other processes since the index was last read
+        """
+        return (key in self._index.index or
+                os.path.exists(os.path.join(self._result_dir(key), SUMMARY_FILE)))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a stored result in the format returned by Backtester.run_backtest
+        """
+        if not self.contains(key):
+            return None
+
+        result_dir = self._result_dir(key)
+        try:
+            equity = pd.read_parquet(os.path.join(result_dir, 'equity.parquet'))
+            trades = pd.read_parquet(os.path.join(result_dir, 'trades.parquet'))
+            positions = pd.read_parquet(os.path.join(result_dir, 'positions.parquet'))
+            metrics = self._read_metrics(result_dir)
+            with open(os.path.join(result_dir, 'portfolio.json')) as f:
+                portfolio = json.load(f)
+        except Exception as e:
+            logger.warning(f"Error loading result {key}: {e}")
+            self.delete(key)
+            return None
+
+        self._pending_access[key] = time.time()
+        if len(self._pending_access) >= self.access_flush_interval:
+            self.flush()
+
+        portfolio['positions'] = {
+            row['symbol']: {'quantity': row['quantity'],
+                            'entry_price': row['entry_price']}
+            for row in positions.to_dict('records')
+        }
+        return {
+            'portfolio': portfolio,
+            'trade_history': trades.to_dict('records'),
+            'performance_metrics': metrics,
+            'equity_curve': equity['value']
+        }
+
+    def put(self, key: str, strategy: Any, start_date: datetime,
+            end_date: datetime, data_hash: str,
+            engine_config: Dict[str, Any], result: Dict[str, Any]):
+        """
+        Store a backtest result under key
+        """
+        result_dir = self._result_dir(key)
+        tmp_dir = f"{result_dir}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        portfolio = result['portfolio']
+        equity = result['equity_curve'].rename('value').to_frame()
+        trades = pd.DataFrame(result['trade_history'], columns=TRADE_COLUMNS)
+        positions = pd.DataFrame(
+            [{'symbol': symbol, **position}
+             for symbol, position in portfolio['positions'].items()],
+            columns=POSITION_COLUMNS
+        )
+        metrics, column_metrics = self._metrics_to_frames(result['performance_metrics'])
+
+        try:
+            equity.to_parquet(os.path.join(tmp_dir, 'equity.parquet'))
+            trades.to_parquet(os.path.join(tmp_dir, 'trades.parquet'))
+            positions.to_parquet(os.path.join(tmp_dir, 'positions.parquet'))
+            metrics.to_parquet(os.path.join(tmp_dir, METRICS_FILE))
+            column_metrics.to_parquet(os.path.join(tmp_dir, COLUMN_METRICS_FILE))
+            with open(os.path.join(tmp_dir, 'portfolio.json'), 'w') as f:
+                json.dump({'cash': float(portfolio['cash']),
+                           'value': float(portfolio.get('value', portfolio['cash']))}, f)
+            now = time.time()
+            total_return = result['performance_metrics'].get('total_return')
+            summary = {
+                'strategy': self._strategy_name(strategy),
+                'params': json.dumps(get_strategy_parameters(strategy),
+                                     sort_keys=True, default=str),
+                'start_date': pd.Timestamp(start_date).isoformat(),
+                'end_date': pd.Timestamp(end_date).isoformat(),
+                'data_hash': data_hash,
+                'engine_config': json.dumps(engine_config, sort_keys=True, default=str),
+                'total_return': float(total_return) if total_return is not None else None,
+                'final_value': float(portfolio.get('value', portfolio['cash'])),
+                'num_trades': len(trades),
+                'size_bytes': self._directory_size(tmp_dir),
+                'created_at': now,
+                'last_accessed': now
+            }
+            with open(os.path.join(tmp_dir, SUMMARY_FILE), 'w') as f:
+                json.dump(summary, f)
+        except Exception as e:
+            logger.warning(f"Error saving result {key}: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+
+        shutil.rmtree(result_dir, ignore_errors=True)
+        os.replace(tmp_dir, result_dir)
+
+        self._update_index(upserts={key: summary})
+
+    def delete(self, key: str):
+        """
+        Remove a stored result
+        """
+        shutil.rmtree(self._result_dir(key), ignore_errors=True)
+        self._pending_access.pop(key, None)
+        self._update_index(deletes=[key])
+
+    def flush(self):
+        """
+        Write pending access times to the index
+        """
+        if self._pending_access:
+            self._update_index()
+
+    def query(self, strategy: Optional[str] = None,
+              start_date: Optional[datetime] = None,
+              end_date: Optional[datetime] = None,
+              **params) -> pd.DataFrame:
+        """
+        Query the summary index of stored results.
+        strategy matches the fully qualified or plain class name, the date
+        bounds select results covering that range and any further keyword
+        arguments match a strategy parameter exactly, whichever of
+        config, parameters or params the strategy keeps it in.
+        """
+        # Re-read so results stored by other processes are included
+        index = self._index = self._load_index()
+        if strategy is not None:
+            names = index['strategy']
+            index = index[(names == strategy) |
+                          names.str.endswith(f".{strategy}")]
+        if start_date is not None:
+            index = index[index['start_date'] <= pd.Timestamp(start_date)]
+        if end_date is not None:
+            index = index[index['end_date'] >= pd.Timestamp(end_date)]
+        if params:
+            parsed = index['params'].map(json.loads)
+            mask = parsed.map(lambda p: all(
+                any(k in group and group[k] == v for group in p.values())
+                for k, v in params.items()))
+            index = index[mask.astype(bool)]
+        return index.drop(columns=['size_bytes', 'last_accessed'])
+
+    def load_many(self, keys: List[str], item: str = 'equity_curve') -> pd.DataFrame:
+        """
+        Load one item ('equity_curve' or 'performance_metrics') for many
+        results into a single frame with one column per key. Metrics are
+        indexed by (metric, field), where field is the original column
+        label of per-column metrics and empty for scalar metrics.
+        """
+        if item not in ('equity_curve', 'performance_metrics'):
+            raise ValueError(f"Unknown result item: {item}")
+
+        frames = {}
+        for key in keys:
+            if not self.contains(key):
+                continue
+            result_dir = self._result_dir(key)
+            if item == 'equity_curve':
+                frames[key] = pd.read_parquet(
+                    os.path.join(result_dir, 'equity.parquet'))['value']
+            else:
+                frames[key] = self._metrics_to_series(self._read_metrics(result_dir))
+        return pd.DataFrame(frames)
+
+    def total_size(self) -> int:
+        """
+        Get total size of stored results in bytes
+        """
+        return int(self._index['size_bytes'].sum())
+
+    def _evict(self, index: pd.DataFrame) -> pd.DataFrame:
+        """
+        Evict least recently accessed results until the store fits
+        within max_size_bytes
+        """
+        if self.max_size_bytes is None:
+            return index
+        by_access = index.sort_values('last_accessed')
+        total = by_access['size_bytes'].sum()
+        evicted = []
+        for key, size in by_access['size_bytes'].items():
+            # Always keep the most recently stored result
+            if total <= self.max_size_bytes or len(evicted) == len(by_access) - 1:
+                break
+            shutil.rmtree(self._result_dir(key), ignore_errors=True)
+            evicted.append(key)
+            total -= size
+        if evicted:
+            logger.info(f"Evicted {len(evicted)} backtest results")
+            index = index.drop(evicted)
+        return index
+
+    def _load_index(self) -> pd.DataFrame:
+        """
+        Load the summary index, or create an empty one
+        """
+        if os.path.exists(self.index_path):
+            try:
+                return pd.read_parquet(self.index_path)
+            except Exception as e:
+                logger.warning(f"Error loading result index: {e}")
+        return pd.DataFrame(columns=INDEX_COLUMNS).set_index('key')
+
+    def _save_index(self, index: pd.DataFrame):
+        """
+        Save the summary index. Must be called while holding the index lock.
+        """
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        index.to_parquet(tmp_path)
+        os.replace(tmp_path, self.index_path)
+
+    def _update_index(self, upserts: Optional[Dict[str, Dict[str, Any]]] = None,
+                      deletes: List[str] = ()):
+        """
+        Merge changes and pending access times into the index on disk.
+        The index is re-read under the lock so rows written by other
+        processes are kept.
+        """
+        with self._index_lock():
+            index = self._load_index()
+            index = index.drop([key for key in deletes if key in index.index])
+            if upserts:
+                rows = self._rows_to_frame(upserts)
+                index = index.drop([key for key in rows.index if key in index.index])
+                index = pd.concat([index, rows]) if len(index) else rows
+
+            for key, accessed in self._pending_access.items():
+                if key in index.index:
+                    index.loc[key, 'last_accessed'] = max(
+                        index.loc[key, 'last_accessed'], accessed)
+            self._pending_access = {}
+
+            index = self._evict(index)
+            self._save_index(index)
+        self._index = index
+
+    def _rebuild_index(self):
+        """
+        Restore index rows from result directories missing from the index,
+        e.g. after a process died between writing a result and the index,
+        and drop rows whose directory no longer exists
+        """
+        stored = {entry.name for entry in os.scandir(self.store_dir)
+                  if entry.is_dir() and not entry.name.endswith('.tmp')}
+        missing = stored.difference(self._index.index)
+        orphaned = set(self._index.index).difference(stored)
+        if not missing and not orphaned:
+            return
+
+        upserts = {}
+        for key in missing:
+            try:
+                with open(os.path.join(self._result_dir(key), SUMMARY_FILE)) as f:
+                    upserts[key] = json.load(f)
+            except Exception as e:
+                logger.warning(f"Error loading summary of result {key}: {e}")
+        if upserts or orphaned:
+            logger.info(f"Restored {len(upserts)} and dropped {len(orphaned)} "
+                        f"result index rows")
+            self._update_index(upserts=upserts, deletes=list(orphaned))
+
+    @contextmanager
+    def _index_lock(self):
+        """
+        Hold an exclusive lock file on the index across processes
+        """
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.lock_path) > LOCK_TIMEOUT:
+                        logger.warning(f"Removing stale index lock {self.lock_path}")
+                        os.remove(self.lock_path)
+                except FileNotFoundError:
+                    pass
+                time.sleep(0.01)
+        try:
+            yield
+        finally:
+            os.close(fd)
+            os.remove(self.lock_path)
+
+    @staticmethod
+    def _rows_to_frame(rows: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Convert summary rows to index rows
+        """
+        frame = pd.DataFrame.from_dict(rows, orient='index')
+        frame = frame.reindex(columns=INDEX_COLUMNS[1:])
+        frame.index.name = 'key'
+        frame['start_date'] = pd.to_datetime(frame['start_date'])
+        frame['end_date'] = pd.to_datetime(frame['end_date'])
+        return frame
+
+    def _result_dir(self, key: str) -> str:
+        return os.path.join(self.store_dir, key)
+
+    @staticmethod
+    def _directory_size(path: str) -> int:
+        return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+    @staticmethod
+    def _strategy_name(strategy: Any) -> str:
+        return f"{type(strategy).__module__}.{type(strategy).__qualname__}"
+
+    @staticmethod
+    def _metrics_to_frames(metrics: Dict[str, Any]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Split metrics into a (metric, value) table of scalar metrics and
+        a long (metric, value) table of per-column metrics indexed by the
+        original column labels, so labels keep their type and levels.
+        Both record each metric's position to restore the original order.
+        """
+        scalars = []
+        per_column = []
+        for position, (name, value) in enumerate(metrics.items()):
+            if isinstance(value, pd.Series):
+                per_column.append(pd.DataFrame({
+                    'metric': name,
+                    'position': position,
+                    'value': value.values.astype(float)
+                }, index=value.index))
+            else:
+                scalars.append((name, position, float(value)))
+
+        scalar_frame = pd.DataFrame(scalars, columns=['metric', 'position', 'value'])
+        if per_column:
+            column_frame = pd.concat(per_column)
+        else:
+            column_frame = pd.DataFrame(columns=['metric', 'position', 'value'])
+        return scalar_frame, column_frame
+
+    @staticmethod
+    def _read_metrics(result_dir: str) -> Dict[str, Any]:
+        """
+        Read metrics in the format returned by Backtester.run_backtest
+        """
+        scalars = pd.read_parquet(os.path.join(result_dir, METRICS_FILE))
+        columns = pd.read_parquet(os.path.join(result_dir, COLUMN_METRICS_FILE))
+
+        items = [(row['position'], row['metric'], row['value'])
+                 for row in scalars.to_dict('records')]
+        for name, group in columns.groupby('metric', sort=False):
+            items.append((group['position'].iloc[0], name,
+                          pd.Series(group['value'].values, index=group.index)))
+        return {name: value for _, name, value in sorted(items, key=lambda item: item[0])}
+
+    @staticmethod
+    def _metrics_to_series(metrics: Dict[str, Any]) -> pd.Series:
+        """
+        Flatten metrics into a Series indexed by (metric, field)
+        """
+        names, fields, values = [], [], []
+        for name, value in metrics.items():
+            if isinstance(value, pd.Series):
+                names.extend([name] * len(value))
+                fields.extend(value.index)
+                values.extend(value.values)
+            else:
+                names.append(name)
+                fields.append('')
+                values.append(value)
+        index = pd.MultiIndex.from_arrays(
+            [pd.Index(names), pd.Index(fields, dtype=object, tupleize_cols=False)],
+            names=['metric', 'field'])
+        return pd.Series(values, index=index, dtype=float)
@@ -2,16 +2,19 @@ import pandas as pd
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 import os
+import hashlib
 import yfinance as yf
 import requests
 import json
 from data.adapters.base_adapter import BaseDataAdapter
+from data.preprocessing.data_pipeline import DataPipeline
 
 class DataLoader:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.cache_dir = self.config.get('cache_dir', './data/cache')
         self.adapters = self._initialize_adapters()
+        self.pipeline = self._initialize_pipeline()
         self._ensure_cache_directory()
 
     def _initialize_adapters(self) -> Dict[str, BaseDataAdapter]:
@@ -25,6 +28,15 @@ class DataLoader:
             adapters[source] = adapter_class(adapter_config)
         return adapters
 
+    def _initialize_pipeline(self) -> Optional[DataPipeline]:
+        """
+        Initialize the preprocessing pipeline if configured
+        """
+        pipeline_config = self.config.get('preprocessing')
+        if not pipeline_config or not pipeline_config.get('enabled', True):
+            return None
+        return DataPipeline(pipeline_config)
+
     def _get_adapter_class(self, adapter_name: str) -> type:
         """
         Get adapter class by name
@@ -48,9 +60,59 @@ class DataLoader:
     def load_historical_data(self, symbols: list, 
                            start_date: datetime, 
                            end_date: datetime,
-                           source: str = 'yfinance') -> pd.DataFrame:
+                           source: str = 'yfinance',
+                           corporate_actions: Optional[pd.DataFrame] = None,
+                           calendar: Optional[pd.DatetimeIndex] = None) -> pd.DataFrame:
+        """
+        Load historical data for given symbols and date range.
+        If a preprocessing pipeline is configured the data is cleaned and
+        aligned, and the processed data, outlier flags and quality report
+        are cached too.
+        """
+        if self.pipeline is None:
+            return self._load_raw_data(symbols, start_date, end_date, source)
+
+        cache_key = self._generate_cache_key(symbols, start_date, end_date, source)
+        suffix = self.pipeline.fingerprint(corporate_actions)[:16]
+        if calendar is not None:
+            calendar_hash = hashlib.sha256(calendar.asi8.tobytes())
+            calendar_hash.update(str(calendar.tz).encode())
+            suffix += calendar_hash.hexdigest()[:8]
+        processed_key = cache_key.replace('.parquet', f"_pp{suffix}.parquet")
+        outliers_key = cache_key.replace('.parquet', f"_pp{suffix}_outliers.parquet")
+        report_key = cache_key.replace('.parquet', f"_pp{suffix}_report.json")
+
+        processed_data = self._load_from_cache(processed_key)
+        outliers = self._load_from_cache(outliers_key)
+        report = self._load_report_from_cache(report_key)
+        if processed_data is not None and outliers is not None and report is not None:
+            self.pipeline.outliers = outliers
+            self.pipeline.report = report
+            return processed_data
+
+        data = self._load_raw_data(symbols, start_date, end_date, source)
+        processed_data = self.pipeline.process(data, calendar=calendar,
+                                               corporate_actions=corporate_actions)
+        self._save_to_cache(processed_key, processed_data)
+        self._save_to_cache(outliers_key, self.pipeline.outliers)
+        self._save_report_to_cache(report_key, self.pipeline.report)
+
+        return processed_data
+
+    def get_outlier_flags(self) -> pd.DataFrame:
+        """
+        Get outlier flags for the last preprocessed data
         """
-        Load historical data for given symbols and date range
+        if self.pipeline is None:
+            return pd.DataFrame()
+        return self.pipeline.outliers
+
+    def _load_raw_data(self, symbols: list,
+                       start_date: datetime,
+                       end_date: datetime,
+                       source: str) -> pd.DataFrame:
+        """
+        Load data as returned by the adapter, using the cache if available
         """
         cache_key = self._generate_cache_key(symbols, start_date, end_date, source)
         cached_data = self._load_from_cache(cache_key)
@@ -94,6 +156,31 @@ class DataLoader:
                 return None
         return None
 
+    def _load_report_from_cache(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a preprocessing report from cache if available
+        """
+        cache_path = os.path.join(self.cache_dir, cache_key)
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path) as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Error loading from cache: {e}")
+                return None
+        return None
+
+    def _save_report_to_cache(self, cache_key: str, report: Dict[str, Any]):
+        """
+        Save a preprocessing report to cache
+        """
+        cache_path = os.path.join(self.cache_dir, cache_key)
+        try:
+            with open(cache_path, 'w') as f:
+                json.dump(report, f)
+        except Exception as e:
+            print(f"Error saving to cache: {e}")
+
     def _save_to_cache(self, cache_key: str, data: pd.DataFrame):
         """
         Save data to cache
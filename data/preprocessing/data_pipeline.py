@@ -0,0 +1,271 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, Optional
+import hashlib
+import json
+import logging
+
+PRICE_FIELDS = {'open', 'high', 'low', 'close', 'adj close', 'adj_close', 'price'}
+VOLUME_FIELDS = {'volume'}
+# Close-type fields in order of preference as the reference price of a bar
+CLOSE_FIELDS = ['close', 'price', 'adj close', 'adj_close']
+
+class DataPipeline:
+    """
+    Data quality and alignment pipeline for multi-symbol market data.
+
+    Works on frames indexed by timestamp with one column per symbol, or
+    with MultiIndex columns holding a symbol level and a field level
+    (open, high, low, close, volume). Every step operates on the whole
+    frame at once rather than per row or per symbol:
+
+    1. Sort and drop duplicate timestamps, keeping the last observation
+    2. Align all symbols to a master calendar
+    3. Apply split adjustments from a corporate actions table
+    4. Flag outlier returns using a rolling z-score
+    5. Fill bars a symbol did not trade on, up to a maximum number of
+       bars, as flat bars at the previous close with zero volume
+    """
+
+    def __init__(self, config: Dict[str, Any] = None):
+        self.config = config or {}
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.outliers = pd.DataFrame()
+        self.report = {}
+        self._initialize_parameters()
+
+    def _initialize_parameters(self):
+        """
+        Initialize pipeline parameters from config
+        """
+        self.calendar_freq = self.config.get('calendar_freq')  # e.g. '1min', None uses union of timestamps
+        self.drop_empty_rows = self.config.get('drop_empty_rows', True)
+        self.max_ffill = self.config.get('max_ffill', 5)  # bars, None for unlimited
+        self.outlier_window = self.config.get('outlier_window', 100)
+        self.outlier_threshold = self.config.get('outlier_threshold', 10.0)  # z-score
+        self.outlier_action = self.config.get('outlier_action', 'flag')  # 'flag' or 'mask'
+        self.symbol_level = self.config.get('symbol_level', -1)
+
+        if self.outlier_action not in ['flag', 'mask']:
+            raise ValueError("Outlier action must be either 'flag' or 'mask'")
+        if self.max_ffill is not None and self.max_ffill < 0:
+            raise ValueError("Forward-fill limit must be non-negative")
+
+    def process(self, data: pd.DataFrame,
+                calendar: Optional[pd.DatetimeIndex] = None,
+                corporate_actions: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Run the full pipeline on data
+
+        Args:
+            data (pd.DataFrame): Raw market data indexed by timestamp
+            calendar (pd.DatetimeIndex): Master calendar to align to,
+                overrides calendar_freq
+            corporate_actions (pd.DataFrame): Split ratios indexed by
+                ex-date with one column per symbol, e.g. 2.0 for a
+                2-for-1 split
+
+        Returns:
+            pd.DataFrame: Cleaned and aligned data
+        """
+        self.report = {'input_rows': len(data)}
+
+        data = self.drop_duplicates(data)
+        data = self.align_to_calendar(data, calendar)
+        if corporate_actions is not None and not corporate_actions.empty:
+            data = self.apply_corporate_actions(data, corporate_actions)
+
+        self.outliers = self.flag_outliers(data)
+        if self.outlier_action == 'mask':
+            data = data.mask(self.outliers)
+
+        data = self.fill_gaps(data)
+
+        self.report['output_rows'] = len(data)
+        self.report['remaining_gaps'] = int(data.isna().values.sum())
+        self.logger.info(f"Preprocessing report: {self.report}")
+        return data
+
+    def drop_duplicates(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Sort by timestamp and drop duplicate timestamps, keeping the last
+        """
+        # Stable sort so the last duplicate received stays last
+        data = data.sort_index(kind='mergesort')
+        duplicated = data.index.duplicated(keep='last')
+        self.report['duplicates_dropped'] = int(duplicated.sum())
+        return data[~duplicated]
+
+    def align_to_calendar(self, data: pd.DataFrame,
+                          calendar: Optional[pd.DatetimeIndex] = None) -> pd.DataFrame:
+        """
+        Reindex data to the master calendar. Without an explicit calendar
+        or calendar_freq the union of all symbols' timestamps is used,
+        which is already the index of a combined frame.
+        """
+        if calendar is None and self.calendar_freq is not None and len(data) > 0:
+            calendar = pd.date_range(data.index[0], data.index[-1],
+                                     freq=self.calendar_freq)
+
+        if calendar is not None:
+            aligned = data.reindex(calendar)
+            if self.drop_empty_rows:
+                # Drop calendar slots where no symbol traded, e.g. outside sessions
+                aligned = aligned[aligned.notna().any(axis=1)]
+            self.report['rows_added'] = len(aligned) - len(data)
+            data = aligned
+        else:
+            self.report['rows_added'] = 0
+
+        return data
+
+    def apply_corporate_actions(self, data: pd.DataFrame,
+                                corporate_actions: pd.DataFrame) -> pd.DataFrame:
+        """
+        Back-adjust prices and volumes for splits. Observations before an
+        ex-date are divided (prices) or multiplied (volumes) by the
+        product of all later split ratios. Naive ex-dates are taken as
+        session dates in the timezone of the data.
+        """
+        ratios = corporate_actions.copy()
+        ratios.index = self._match_timezone(pd.DatetimeIndex(ratios.index), data.index)
+        ratios = ratios.sort_index().fillna(1.0)
+        ratios = ratios.groupby(level=0).prod()
+
+        # Cumulative product of ratios at or after each ex-date, with a
+        # trailing row of ones for timestamps after the last action
+        cumulative = ratios.iloc[::-1].cumprod().iloc[::-1].values
+        cumulative = np.vstack([cumulative, np.ones((1, cumulative.shape[1]))])
+
+        # For each timestamp, the first ex-date strictly after it
+        positions = ratios.index.searchsorted(data.index, side='right')
+        factors = pd.DataFrame(cumulative[positions], index=data.index,
+                               columns=ratios.columns)
+
+        symbols = self._column_symbols(data)
+        factors = factors.reindex(columns=pd.unique(symbols)).fillna(1.0)
+        factor_matrix = factors[symbols].values
+
+        fields = self._column_fields(data)
+        is_price = np.array([field in PRICE_FIELDS for field in fields])
+        is_volume = np.array([field in VOLUME_FIELDS for field in fields])
+
+        values = data.values.astype(float)
+        values[:, is_price] /= factor_matrix[:, is_price]
+        values[:, is_volume] *= factor_matrix[:, is_volume]
+
+        self.report['adjusted_symbols'] = int((factors != 1.0).any().sum())
+        return pd.DataFrame(values, index=data.index, columns=data.columns)
+
+    def flag_outliers(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Flag price observations whose return deviates from the trailing
+        rolling mean by more than outlier_threshold standard deviations
+        """
+        fields = self._column_fields(data)
+        is_price = np.array([field in PRICE_FIELDS for field in fields])
+        prices = data.loc[:, is_price]
+
+        # Returns across gaps are measured from the last known price
+        filled = prices.ffill()
+        returns = filled / filled.shift(1) - 1
+
+        # Trailing statistics exclude the current bar so a spike cannot
+        # inflate its own deviation
+        rolling = returns.rolling(self.outlier_window,
+                                  min_periods=max(2, self.outlier_window // 2))
+        mean = rolling.mean().shift(1)
+        std = rolling.std().shift(1)
+        zscore = (returns - mean).abs() / std.replace(0.0, np.nan)
+
+        flags = pd.DataFrame(False, index=data.index, columns=data.columns)
+        flags.loc[:, is_price] = ((zscore > self.outlier_threshold) & prices.notna()).values
+
+        self.report['outliers_flagged'] = int(flags.values.sum())
+        return flags
+
+    def fill_gaps(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fill missing bars up to max_ffill consecutive bars. Close-type
+        prices are forward-filled, open, high and low of a filled bar are
+        set to the previous close and its volume to 0, so no trading is
+        invented. Leading gaps before a symbol's first observation are
+        left empty.
+        """
+        values = data.values.astype(float)
+        filled = data.ffill(limit=self.max_ffill).values.astype(float)
+        missing = np.isnan(values)
+
+        # Each column follows the close of its symbol, or itself if the
+        # symbol has no close-type field
+        fields = self._column_fields(data)
+        symbols = self._column_symbols(data)
+        closes = {}
+        for position, (symbol, field) in enumerate(zip(symbols, fields)):
+            if field in CLOSE_FIELDS:
+                current = closes.get(symbol)
+                if current is None or (CLOSE_FIELDS.index(field) <
+                                       CLOSE_FIELDS.index(fields[current])):
+                    closes[symbol] = position
+        reference = np.array([closes.get(symbol, position)
+                              for position, symbol in enumerate(symbols)], dtype=int)
+
+        # Bars filled on the reference column
+        filled_bar = missing[:, reference] & ~np.isnan(filled[:, reference])
+        is_volume = np.array([field in VOLUME_FIELDS for field in fields])
+        is_range = np.array([field in PRICE_FIELDS and field not in CLOSE_FIELDS
+                             for field in fields])
+        is_other = ~(is_volume | is_range)
+
+        result = values.copy()
+        result[:, is_other] = filled[:, is_other]
+        fill_range = missing[:, is_range] & filled_bar[:, is_range]
+        result[:, is_range] = np.where(fill_range, filled[:, reference[is_range]],
+                                       values[:, is_range])
+        fill_volume = missing[:, is_volume] & filled_bar[:, is_volume]
+        result[:, is_volume] = np.where(fill_volume, 0.0, values[:, is_volume])
+
+        self.report['values_filled'] = int(missing.sum() - np.isnan(result).sum())
+        return pd.DataFrame(result, index=data.index, columns=data.columns)
+
+    def fingerprint(self, corporate_actions: Optional[pd.DataFrame] = None) -> str:
+        """
+        Hash of the pipeline configuration and inputs, for cache keys
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps(self.config, sort_keys=True, default=str).encode())
+        if corporate_actions is not None and not corporate_actions.empty:
+            digest.update(repr(list(corporate_actions.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(
+                corporate_actions, index=True).values.tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _match_timezone(dates: pd.DatetimeIndex,
+                        index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+        """
+        Convert dates to the timezone of index so they can be compared
+        """
+        tz = getattr(index, 'tz', None)
+        if dates.tz is None:
+            return dates.tz_localize(tz) if tz is not None else dates
+        return dates.tz_convert(tz)
+
+    def _column_symbols(self, data: pd.DataFrame) -> pd.Index:
+        """
+        Get the symbol of each column
+        """
+        if isinstance(data.columns, pd.MultiIndex):
+            return data.columns.get_level_values(self.symbol_level)
+        return data.columns
+
+    def _column_fields(self, data: pd.DataFrame) -> list:
+        """
+        Get the lowercased field of each column. Flat frames hold one
+        price per symbol.
+        """
+        if isinstance(data.columns, pd.MultiIndex):
+            field_level = 0 if self.symbol_level in (-1, data.columns.nlevels - 1) else -1
+            return [str(field).lower()
+                    for field in data.columns.get_level_values(field_level)]
+        return ['price'] * len(data.columns)
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data.preprocessing.data_pipeline import DataPipeline
+
+@pytest.fixture
+def gapped_data():
+    index = pd.to_datetime(['2024-01-02 09:30', '2024-01-02 09:31',
+                            '2024-01-02 09:31', '2024-01-02 09:32',
+                            '2024-01-02 09:33', '2024-01-02 09:34',
+                            '2024-01-02 09:35'])
+    return pd.DataFrame({
+        'AAA': [10.0, 11.0, 12.0, np.nan, np.nan, np.nan, 13.0],
+        'BBB': [20.0, 20.0, 21.0, 22.0, 23.0, 24.0, 25.0]
+    }, index=index)
+
+def test_duplicates_keep_last_observation(gapped_data):
+    pipeline = DataPipeline({'max_ffill': 2})
+    result = pipeline.process(gapped_data)
+
+    assert pipeline.report['duplicates_dropped'] == 1
+    assert result.index.is_unique
+    assert len(result) == 6
+    assert result.loc['2024-01-02 09:31', 'AAA'] == 12.0
+
+def test_forward_fill_is_capped(gapped_data):
+    pipeline = DataPipeline({'max_ffill': 2})
+    result = pipeline.process(gapped_data)
+
+    assert result['AAA'].iloc[:4].tolist() == [10.0, 12.0, 12.0, 12.0]
+    assert np.isnan(result.loc['2024-01-02 09:34', 'AAA'])
+    assert result.loc['2024-01-02 09:35', 'AAA'] == 13.0
+    assert pipeline.report['values_filled'] == 2
+
+def test_filled_bars_are_flat_with_zero_volume():
+    index = pd.date_range('2024-01-02 09:30', periods=5, freq='1min')
+    columns = pd.MultiIndex.from_product([['Open', 'High', 'Low', 'Close', 'Volume'],
+                                          ['AAA']])
+    data = pd.DataFrame([[1.0, 2.0, 0.5, 1.5, 100.0],
+                         [2.0, 3.0, 1.0, 2.5, 110.0],
+                         [np.nan] * 5,
+                         [np.nan] * 5,
+                         [3.0, 4.0, 2.0, 3.5, 120.0]],
+                        index=index, columns=columns)
+    result = DataPipeline({'max_ffill': 1}).process(data)
+
+    assert result.iloc[2].tolist() == [2.5, 2.5, 2.5, 2.5, 0.0]
+    assert result.iloc[3].isna().all()
+
+def test_split_adjusts_prices_and_volumes():
+    index = pd.date_range('2024-01-02', periods=4, freq='D')
+    columns = pd.MultiIndex.from_product([['close', 'volume'], ['AAA', 'BBB']])
+    data = pd.DataFrame([[100.0, 50.0, 1000.0, 500.0],
+                         [102.0, 51.0, 1000.0, 500.0],
+                         [51.0, 52.0, 2000.0, 500.0],
+                         [52.0, 53.0, 2000.0, 500.0]],
+                        index=index, columns=columns)
+    actions = pd.DataFrame({'AAA': [2.0]}, index=[index[2]])
+    result = DataPipeline().process(data, corporate_actions=actions)
+
+    assert result[('close', 'AAA')].tolist() == [50.0, 51.0, 51.0, 52.0]
+    assert result[('volume', 'AAA')].tolist() == [2000.0] * 4
+    assert result[('close', 'BBB')].equals(data[('close', 'BBB')])
+    assert result[('volume', 'BBB')].equals(data[('volume', 'BBB')])
+
+def test_naive_ex_dates_apply_to_tz_aware_bars():
+    index = pd.date_range('2024-01-02 09:30', periods=4, freq='D', tz='America/New_York')
+    data = pd.DataFrame({'AAA': [100.0, 102.0, 51.0, 52.0]}, index=index)
+    actions = pd.DataFrame({'AAA': [2.0]}, index=pd.to_datetime(['2024-01-04']))
+    result = DataPipeline().process(data, corporate_actions=actions)
+
+    assert result['AAA'].tolist() == [50.0, 51.0, 51.0, 52.0]